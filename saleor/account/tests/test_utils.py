@@ -79,8 +79,9 @@ def test_store_user_address_uses_existing_one(address):
     expected_user_addresses_count = 1
 
     manager = get_plugins_manager()
-    store_user_address(user, address, AddressType.BILLING, manager)
+    is_user_address = store_user_address(user, address, AddressType.BILLING, manager)
 
+    assert is_user_address is True
     assert user.addresses.count() == expected_user_addresses_count
     assert user.default_billing_address_id == address.pk
 
@@ -112,8 +113,9 @@ def test_store_user_address_create_new_address_if_not_associated(address):
     expected_user_addresses_count = 1
 
     manager = get_plugins_manager()
-    store_user_address(user, address, AddressType.BILLING, manager)
+    is_user_address = store_user_address(user, address, AddressType.BILLING, manager)
 
+    assert is_user_address is False
     assert user.addresses.count() == expected_user_addresses_count
     assert user.default_billing_address_id != address.pk
 
@@ -130,8 +132,9 @@ def test_store_user_address_address_not_saved(address):
     address_count = user.addresses.count()
 
     manager = get_plugins_manager()
-    store_user_address(user, address, AddressType.BILLING, manager)
+    is_user_address = store_user_address(user, address, AddressType.BILLING, manager)
 
+    assert is_user_address is True
     assert user.addresses.count() == address_count
 
 
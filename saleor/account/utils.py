@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.db.models import Exists, OuterRef
+from django.db.models import Count, Exists, OuterRef, Q
 
 from ..checkout import AddressType
 from ..permission.models import Permission
@@ -17,14 +17,22 @@ def store_user_address(
     address: "Address",
     address_type: str,
     manager: "PluginsManager",
-):
-    """Add address to user address book and set as default one."""
+) -> bool:
+    """Add address to user address book and set as default one.
+
+    Return True if the given address instance belongs to the user address book.
+    """
+    addresses_info = user.addresses.aggregate(
+        addresses_count=Count("pk"),
+        is_user_address=Count("pk", filter=Q(pk=address.pk)),
+    )
+    is_user_address = bool(addresses_info["is_user_address"])
 
     # user can only have specified number of addresses
     # so we do not want to store additional one if user already reached the max
     # number of addresses
-    if is_user_address_limit_reached(user):
-        return
+    if addresses_info["addresses_count"] >= settings.MAX_USER_ADDRESSES:
+        return is_user_address
 
     address = manager.change_user_address(address, address_type, user)
     address_data = address.as_data()
@@ -39,6 +47,7 @@ def store_user_address(
     elif address_type == AddressType.SHIPPING:
         if not user.default_shipping_address:
             set_user_default_shipping_address(user, address)
+    return is_user_address
 
 
 def is_user_address_limit_reached(user: "User"):
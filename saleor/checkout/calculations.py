@@ -1,5 +1,6 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+from uuid import UUID
 
 from django.conf import settings
 from django.utils import timezone
@@ -109,6 +110,40 @@ def calculate_checkout_total_with_gift_cards(
     return max(total, zero_taxed_money(total.currency))
 
 
+def checkout_prices_bulk(
+    *,
+    manager: "PluginsManager",
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    address: Optional["Address"],
+) -> Tuple[TaxedMoney, TaxedMoney, TaxedMoney, Decimal]:
+    """Return the checkout total with gift cards, subtotal, shipping price and tax rate.
+
+    Prices are fetched once for all the returned values instead of once per
+    value, so the taxes are never recalculated in between.
+
+    It takes in account all plugins.
+    """
+    currency = checkout_info.checkout.currency
+    checkout_info, _ = fetch_checkout_data(
+        checkout_info,
+        manager=manager,
+        lines=lines,
+        address=address,
+    )
+    checkout = checkout_info.checkout
+    total = (
+        quantize_price(checkout.total, currency)
+        - checkout.get_total_gift_cards_balance()
+    )
+    return (
+        max(total, zero_taxed_money(currency)),
+        quantize_price(checkout.subtotal, currency),
+        quantize_price(checkout.shipping_price, currency),
+        checkout.shipping_tax_rate,
+    )
+
+
 def checkout_total(
     *,
     manager: "PluginsManager",
@@ -217,6 +252,40 @@ def checkout_line_tax_rate(
     return checkout_line_info.line.tax_rate
 
 
+def checkout_lines_totals_bulk(
+    *,
+    manager: "PluginsManager",
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+) -> Dict[UUID, Tuple[TaxedMoney, TaxedMoney, Decimal]]:
+    """Return the total price, unit price and tax rate of all provided lines.
+
+    The result is keyed by the checkout line pk. Prices are fetched once for
+    the whole checkout instead of once per line and per price.
+
+    It takes in account all plugins.
+    """
+    currency = checkout_info.checkout.currency
+    address = checkout_info.shipping_address or checkout_info.billing_address
+    _, lines = fetch_checkout_data(
+        checkout_info,
+        manager=manager,
+        lines=lines,
+        address=address,
+    )
+    lines_prices = {}
+    for line_info in lines:
+        checkout_line = line_info.line
+        lines_prices[checkout_line.pk] = (
+            quantize_price(checkout_line.total_price, currency),
+            quantize_price(
+                checkout_line.total_price / checkout_line.quantity, currency
+            ),
+            checkout_line.tax_rate,
+        )
+    return lines_prices
+
+
 def _fetch_checkout_prices_if_expired(
     checkout_info: "CheckoutInfo",
     manager: "PluginsManager",
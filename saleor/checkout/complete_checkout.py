@@ -16,8 +16,8 @@ from uuid import UUID
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from django.forms.models import model_to_dict
+from django.db import connection, transaction
+from django.db.models import BooleanField, Value, prefetch_related_objects
 from django.utils import timezone
 from prices import Money, TaxedMoney
 
@@ -28,8 +28,7 @@ from ..channel import MarkAsPaidStrategy
 from ..checkout import CheckoutAuthorizeStatus, calculations
 from ..checkout.error_codes import CheckoutErrorCode
 from ..core.exceptions import GiftCardNotApplicable, InsufficientStock
-from ..core.postgres import FlatConcatSearchVector
-from ..core.taxes import TaxError, zero_taxed_money
+from ..core.taxes import TaxError
 from ..core.tracing import traced_atomic_transaction
 from ..core.transactions import transaction_with_commit_on_errors
 from ..core.utils.url import validate_storefront_url
@@ -38,7 +37,7 @@ from ..discount.models import NotApplicable, OrderLineDiscount
 from ..discount.utils import (
     add_voucher_usage_by_customer,
     get_sale_id,
-    increase_voucher_usage,
+    increase_voucher_usage_within_limit,
     prepare_promotion_discount_reason,
     release_voucher_usage,
 )
@@ -46,18 +45,22 @@ from ..graphql.checkout.utils import (
     prepare_insufficient_stock_checkout_validation_error,
 )
 from ..order import OrderOrigin, OrderStatus
-from ..order.actions import mark_order_as_paid_with_payment, order_created
-from ..order.fetch import OrderInfo, OrderLineInfo
+from ..order.actions import mark_order_as_paid_with_payment
+from ..order.fetch import OrderLineInfo
 from ..order.models import Order, OrderLine
-from ..order.notifications import send_order_confirmation
-from ..order.search import prepare_order_search_vector_value
+from ..order.tasks import (
+    order_created_task,
+    send_order_confirmation_task,
+    update_order_search_vector_task,
+)
 from ..order.utils import (
-    update_order_authorize_data,
-    update_order_charge_data,
+    update_order_authorize_status,
+    update_order_charge_status,
     update_order_display_gross_prices,
+    updates_amounts_for_order,
 )
 from ..payment import PaymentError, TransactionKind, gateway
-from ..payment.models import Payment, Transaction
+from ..payment.models import Payment, Transaction, TransactionItem
 from ..payment.utils import fetch_customer_id, store_customer_id
 from ..product.models import ProductTranslation, ProductVariantTranslation
 from ..tax.utils import (
@@ -89,18 +92,24 @@ from .fetch import (
     fetch_checkout_lines,
 )
 from .models import Checkout
-from .utils import (
-    get_checkout_metadata,
-    get_or_create_checkout_metadata,
-    get_voucher_for_checkout_info,
-)
+from .utils import get_checkout_metadata, get_voucher_for_checkout_info
 
 if TYPE_CHECKING:
     from ..app.models import App
     from ..plugins.manager import PluginsManager
+    from ..product.models import DigitalContent
     from ..site.models import SiteSettings
 
 
+# Postgres accepts at most 65535 bind parameters in a single query and every
+# inserted row takes one parameter per column, so the batch sizes of the bulk
+# inserts are derived from the number of the model columns. Order line discounts
+# have fewer columns than order lines and use the order lines batch size.
+MAX_QUERY_PARAMETERS = 65535
+ORDER_LINES_BATCH_SIZE = MAX_QUERY_PARAMETERS // len(OrderLine._meta.concrete_fields)
+RESERVATIONS_BATCH_SIZE = MAX_QUERY_PARAMETERS // len(Reservation._meta.concrete_fields)
+
+
 def _process_voucher_data_for_order(checkout_info: "CheckoutInfo") -> dict:
     """Fetch, process and return voucher/discount data from checkout.
 
@@ -110,7 +119,7 @@ def _process_voucher_data_for_order(checkout_info: "CheckoutInfo") -> dict:
     :raises NotApplicable: When the voucher is not applicable in the current checkout.
     """
     checkout = checkout_info.checkout
-    voucher = get_voucher_for_checkout_info(checkout_info, with_lock=True)
+    voucher = get_voucher_for_checkout_info(checkout_info)
 
     if checkout.voucher_code and not voucher:
         msg = "Voucher expired in meantime. Order placement aborted."
@@ -119,8 +128,9 @@ def _process_voucher_data_for_order(checkout_info: "CheckoutInfo") -> dict:
     if not voucher:
         return {}
 
-    if voucher.usage_limit:
-        increase_voucher_usage(voucher)
+    if voucher.usage_limit and not increase_voucher_usage_within_limit(voucher):
+        msg = "Voucher usage limit reached in meantime. Order placement aborted."
+        raise NotApplicable(msg)
     if voucher.apply_once_per_customer:
         customer_email = cast(str, checkout_info.get_customer_email())
         add_voucher_usage_by_customer(voucher, customer_email)
@@ -145,10 +155,10 @@ def _process_shipping_data_for_order(
         and checkout_info.user
         and shipping_address
     ):
-        store_user_address(
+        is_user_address = store_user_address(
             checkout_info.user, shipping_address, AddressType.SHIPPING, manager=manager
         )
-        if checkout_info.user.addresses.filter(pk=shipping_address.pk).exists():
+        if is_user_address:
             shipping_address = shipping_address.get_copy()
 
     shipping_method = delivery_method_info.delivery_method
@@ -172,10 +182,10 @@ def _process_user_data_for_order(checkout_info: "CheckoutInfo", manager):
     billing_address = checkout_info.billing_address
 
     if checkout_info.user and billing_address:
-        store_user_address(
+        is_user_address = store_user_address(
             checkout_info.user, billing_address, AddressType.BILLING, manager=manager
         )
-        if checkout_info.user.addresses.filter(pk=billing_address.pk).exists():
+        if is_user_address:
             billing_address = billing_address.get_copy()
 
     return {
@@ -187,10 +197,10 @@ def _process_user_data_for_order(checkout_info: "CheckoutInfo", manager):
 
 
 def _create_line_for_order(
-    manager: "PluginsManager",
     checkout_info: "CheckoutInfo",
-    lines: Iterable["CheckoutLineInfo"],
     checkout_line_info: "CheckoutLineInfo",
+    line_prices: Tuple[TaxedMoney, TaxedMoney, Decimal],
+    variant_data: Tuple[str, bool, bool, Optional["DigitalContent"]],
     products_translation: Dict[int, Optional[str]],
     variants_translation: Dict[int, Optional[str]],
     prices_entered_with_tax: bool,
@@ -203,9 +213,17 @@ def _create_line_for_order(
     quantity = checkout_line.quantity
     variant = checkout_line_info.variant
     product = checkout_line_info.product
-
-    product_name = str(product)
-    variant_name = str(variant)
+    channel = checkout_info.channel
+    (
+        variant_global_id,
+        is_shipping_required,
+        is_gift_card,
+        digital_content,
+    ) = variant_data
+
+    product_name = product.name
+    # same as ProductVariant.__str__
+    variant_name = variant.name or variant.sku or f"ID:{variant.pk}"
 
     translated_product_name = products_translation.get(product.id, "")
     translated_variant_name = variants_translation.get(variant.id, "")
@@ -219,17 +237,17 @@ def _create_line_for_order(
     # the price with sale and discounts applied - base price that is used for
     # total price calculation
     base_unit_price = calculate_base_line_unit_price(
-        line_info=checkout_line_info, channel=checkout_info.channel
+        line_info=checkout_line_info, channel=channel
     )
     # the unit price before applying any discount (sale or voucher)
     undiscounted_base_unit_price = calculate_undiscounted_base_line_unit_price(
         line_info=checkout_line_info,
-        channel=checkout_info.channel,
+        channel=channel,
     )
     # the total price before applying any discount (sale or voucher)
     undiscounted_base_total_price = calculate_undiscounted_base_line_total_price(
         line_info=checkout_line_info,
-        channel=checkout_info.channel,
+        channel=channel,
     )
     undiscounted_unit_price = TaxedMoney(
         net=undiscounted_base_unit_price, gross=undiscounted_base_unit_price
@@ -237,36 +255,19 @@ def _create_line_for_order(
     undiscounted_total_price = TaxedMoney(
         net=undiscounted_base_total_price, gross=undiscounted_base_total_price
     )
-    # total price after applying all discounts - sales and vouchers
-    total_line_price = calculations.checkout_line_total(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        checkout_line_info=checkout_line_info,
-    )
-    # unit price after applying all discounts - sales and vouchers
-    unit_price = calculations.checkout_line_unit_price(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        checkout_line_info=checkout_line_info,
-    )
-    tax_rate = calculations.checkout_line_tax_rate(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        checkout_line_info=checkout_line_info,
-    )
+    # total and unit price after applying all discounts - sales and vouchers
+    total_line_price, unit_price, tax_rate = line_prices
 
     voucher_code = None
     if checkout_line_info.voucher:
         voucher_code = checkout_line_info.voucher.code
 
-    discount_price = undiscounted_unit_price - unit_price
+    # the undiscounted unit price has the same net and gross amount, only the
+    # side matching the channel tax configuration is needed
     if prices_entered_with_tax:
-        discount_amount = discount_price.gross
+        discount_amount = undiscounted_base_unit_price - unit_price.gross
     else:
-        discount_amount = discount_price.net
+        discount_amount = undiscounted_base_unit_price - unit_price.net
 
     unit_discount_reason = None
     if voucher_code:
@@ -284,9 +285,9 @@ def _create_line_for_order(
         translated_product_name=translated_product_name,
         translated_variant_name=translated_variant_name,
         product_sku=variant.sku,
-        product_variant_id=variant.get_global_id(),
-        is_shipping_required=variant.is_shipping_required(),
-        is_gift_card=variant.is_gift_card(),
+        product_variant_id=variant_global_id,
+        is_shipping_required=is_shipping_required,
+        is_gift_card=is_gift_card,
         quantity=quantity,
         variant=variant,
         unit_price=unit_price,  # money field not supported by mypy_django_plugin
@@ -324,13 +325,12 @@ def _create_line_for_order(
         )
         line.unit_discount_reason = unit_discount_reason
 
-    is_digital = line.is_digital
     line_info = OrderLineInfo(
         line=line,
         quantity=quantity,
-        is_digital=is_digital,
+        is_digital=digital_content is not None,
         variant=variant,
-        digital_content=variant.digital_content if is_digital and variant else None,
+        digital_content=digital_content,
         warehouse_pk=checkout_info.delivery_method_info.warehouse_pk,
         line_discounts=line_discounts,
     )
@@ -341,15 +341,22 @@ def _create_line_for_order(
 def _create_order_line_discounts(
     checkout_line_info: "CheckoutLineInfo", order_line: "OrderLine"
 ) -> List["OrderLineDiscount"]:
-    line_discounts = []
-    discounts = checkout_line_info.get_promotion_discounts()
-    for discount in discounts:
-        discount_data = model_to_dict(discount)
-        discount_data.pop("line")
-        discount_data["promotion_rule_id"] = discount_data.pop("promotion_rule")
-        discount_data["line_id"] = order_line.pk
-        line_discounts.append(OrderLineDiscount(**discount_data))
-    return line_discounts
+    return [
+        OrderLineDiscount(
+            line_id=order_line.pk,
+            type=discount.type,
+            value_type=discount.value_type,
+            value=discount.value,
+            amount_value=discount.amount_value,
+            currency=discount.currency,
+            name=discount.name,
+            translated_name=discount.translated_name,
+            reason=discount.reason,
+            promotion_rule_id=discount.promotion_rule_id,
+            voucher_id=discount.voucher_id,
+        )
+        for discount in checkout_line_info.get_promotion_discounts()
+    ]
 
 
 def _create_lines_for_order(
@@ -357,9 +364,12 @@ def _create_lines_for_order(
     checkout_info: "CheckoutInfo",
     lines: Iterable["CheckoutLineInfo"],
     prices_entered_with_tax: bool,
-) -> Iterable[OrderLineInfo]:
+) -> List[OrderLineInfo]:
     """Create a lines for the given order.
 
+    The lines are returned as a list, as they are iterated several times when
+    the order is created.
+
     :raises InsufficientStock: when there is not enough items in stock for this variant.
     """
     translation_language_code = checkout_info.checkout.language_code
@@ -373,22 +383,7 @@ def _create_lines_for_order(
         quantities.append(line_info.line.quantity)
         products.append(line_info.product)
 
-    products_translation = ProductTranslation.objects.filter(
-        product__in=products, language_code=translation_language_code
-    ).values("product_id", "name")
-    product_translations = {
-        product_translation["product_id"]: product_translation.get("name")
-        for product_translation in products_translation
-    }
-
-    variants_translation = ProductVariantTranslation.objects.filter(
-        product_variant__in=variants, language_code=translation_language_code
-    ).values("product_variant_id", "name")
-    variants_translation = {
-        variant_translation["product_variant_id"]: variant_translation.get("name")
-        for variant_translation in variants_translation
-    }
-
+    # check the stock first, so the remaining queries are skipped when it fails
     additional_warehouse_lookup = (
         checkout_info.delivery_method_info.get_warehouse_filter_lookup()
     )
@@ -404,12 +399,56 @@ def _create_lines_for_order(
         replace=True,
         check_reservations=True,
     )
+
+    # digital content is checked for every line, fetch it for all variants at once
+    prefetch_related_objects(variants, "digital_content")
+    # the same variant can be used by multiple lines, compute its data only once
+    variants_data = {
+        variant.pk: (
+            variant.get_global_id(),
+            variant.is_shipping_required(),
+            variant.is_gift_card(),
+            getattr(variant, "digital_content", None) if variant.is_digital() else None,
+        )
+        for variant in variants
+    }
+
+    # fetch product and variant translations in a single query
+    products_translation_qs = (
+        ProductTranslation.objects.filter(
+            product__in=products, language_code=translation_language_code
+        )
+        .annotate(is_variant=Value(False, output_field=BooleanField()))
+        .values_list("product_id", "name", "is_variant")
+    )
+    variants_translation_qs = (
+        ProductVariantTranslation.objects.filter(
+            product_variant__in=variants, language_code=translation_language_code
+        )
+        .annotate(is_variant=Value(True, output_field=BooleanField()))
+        .values_list("product_variant_id", "name", "is_variant")
+    )
+    product_translations: Dict[int, Optional[str]] = {}
+    variants_translation: Dict[int, Optional[str]] = {}
+    for object_id, name, is_variant in products_translation_qs.union(
+        variants_translation_qs, all=True
+    ):
+        if is_variant:
+            variants_translation[object_id] = name
+        else:
+            product_translations[object_id] = name
+
+    lines_prices = calculations.checkout_lines_totals_bulk(
+        manager=manager,
+        checkout_info=checkout_info,
+        lines=lines,
+    )
     return [
         _create_line_for_order(
-            manager,
             checkout_info,
-            lines,
             checkout_line_info,
+            lines_prices[checkout_line_info.line.pk],
+            variants_data[checkout_line_info.variant.pk],
             product_translations,
             variants_translation,
             prices_entered_with_tax,
@@ -418,6 +457,25 @@ def _create_lines_for_order(
     ]
 
 
+def _sum_order_lines_price(
+    order_lines_info: Iterable[OrderLineInfo], price_field: str, currency: str
+) -> TaxedMoney:
+    """Return the sum of the given order line price field.
+
+    Amounts are summed as decimals to avoid creating intermediate money objects
+    for every line.
+    """
+    net_amount_field = f"{price_field}_net_amount"
+    gross_amount_field = f"{price_field}_gross_amount"
+    net_amount = gross_amount = Decimal(0)
+    for line_info in order_lines_info:
+        net_amount += getattr(line_info.line, net_amount_field)
+        gross_amount += getattr(line_info.line, gross_amount_field)
+    return TaxedMoney(
+        net=Money(net_amount, currency), gross=Money(gross_amount, currency)
+    )
+
+
 def _prepare_order_data(
     *,
     manager: "PluginsManager",
@@ -435,26 +493,18 @@ def _prepare_order_data(
         checkout_info.shipping_address or checkout_info.billing_address
     )  # FIXME: check which address we need here
 
-    taxed_total = calculations.calculate_checkout_total_with_gift_cards(
+    (
+        taxed_total,
+        subtotal,
+        shipping_total,
+        shipping_tax_rate,
+    ) = calculations.checkout_prices_bulk(
         manager=manager,
         checkout_info=checkout_info,
         lines=lines,
         address=address,
     )
-
     base_shipping_price = base_checkout_delivery_price(checkout_info, lines)
-    shipping_total = calculations.checkout_shipping_price(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        address=address,
-    )
-    shipping_tax_rate = calculations.checkout_shipping_tax_rate(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=lines,
-        address=address,
-    )
     order_data.update(
         _process_shipping_data_for_order(
             checkout_info, base_shipping_price, shipping_total, manager, lines
@@ -469,9 +519,8 @@ def _prepare_order_data(
         prices_entered_with_tax,
     )
     undiscounted_total = (
-        sum(
-            [line.line.undiscounted_total_price for line in order_data["lines"]],
-            start=zero_taxed_money(taxed_total.currency),
+        _sum_order_lines_price(
+            order_data["lines"], "undiscounted_total_price", taxed_total.currency
         )
         + shipping_total
     )
@@ -492,14 +541,7 @@ def _prepare_order_data(
     order_data.update(_process_voucher_data_for_order(checkout_info))
 
     order_data["total_price_left"] = (
-        calculations.checkout_subtotal(
-            manager=manager,
-            checkout_info=checkout_info,
-            lines=lines,
-            address=address,
-        )
-        + shipping_total
-        - checkout.discount
+        subtotal + shipping_total - checkout.discount
     ).gross
 
     try:
@@ -571,12 +613,14 @@ def _create_order(
         line = line_info.line
         line.order_id = order.pk
         order_lines.append(line)
-        if discounts := line_info.line_discounts:
-            order_line_discounts.extend(discounts)
+        order_line_discounts.extend(line_info.line_discounts or ())
 
-    OrderLine.objects.bulk_create(order_lines)
-    OrderLineDiscount.objects.bulk_create(order_line_discounts)
+    OrderLine.objects.bulk_create(order_lines, batch_size=ORDER_LINES_BATCH_SIZE)
+    OrderLineDiscount.objects.bulk_create(
+        order_line_discounts, batch_size=ORDER_LINES_BATCH_SIZE
+    )
 
+    raw_checkout_lines = [line_info.line for line_info in checkout_lines]
     country_code = checkout_info.get_country()
     additional_warehouse_lookup = (
         checkout_info.delivery_method_info.get_warehouse_filter_lookup()
@@ -589,13 +633,13 @@ def _create_order(
         checkout_info.delivery_method_info.warehouse_pk,
         additional_warehouse_lookup,
         check_reservations=True,
-        checkout_lines=[line.line for line in checkout_lines],
+        checkout_lines=raw_checkout_lines,
     )
     allocate_preorders(
         order_lines_info,
         checkout_info.channel.slug,
         check_reservations=is_reservation_enabled(site_settings),
-        checkout_lines=[line.line for line in checkout_lines],
+        checkout_lines=raw_checkout_lines,
     )
 
     add_gift_cards_to_order(checkout_info, order, total_price_left, user, app)
@@ -608,48 +652,41 @@ def _create_order(
     update_order_display_gross_prices(order)
 
     # copy metadata from the checkout into the new order
-    order.metadata = checkout_metadata.metadata
+    order.metadata = dict(checkout_metadata.metadata or {})
     if metadata_list:
-        order.store_value_in_metadata({data.key: data.value for data in metadata_list})
+        order.metadata.update((data.key, data.value) for data in metadata_list)
 
     order.redirect_url = checkout.redirect_url
 
-    order.private_metadata = checkout_metadata.private_metadata
+    order.private_metadata = dict(checkout_metadata.private_metadata or {})
     if private_metadata_list:
-        order.store_value_in_private_metadata(
-            {data.key: data.value for data in private_metadata_list}
+        order.private_metadata.update(
+            (data.key, data.value) for data in private_metadata_list
         )
 
-    update_order_charge_data(order, with_save=False)
-    update_order_authorize_data(order, with_save=False)
-    order.search_vector = FlatConcatSearchVector(
-        *prepare_order_search_vector_value(order)
+    # the payments, transactions and granted refunds querysets are shared between
+    # the charge and authorize calculations, so each of them is fetched once
+    updates_amounts_for_order(order, save=False)
+    order.save(
+        update_fields=[
+            "display_gross_prices",
+            "metadata",
+            "private_metadata",
+            "redirect_url",
+            "total_charged_amount",
+            "charge_status",
+            "total_authorized_amount",
+            "authorize_status",
+            "updated_at",
+        ]
     )
-    order.save()
-
-    order_info = OrderInfo(
+    _post_create_order_actions(
         order=order,
-        customer_email=order_data["user_email"],
-        channel=checkout_info.channel,
+        checkout_info=checkout_info,
+        user=user,
+        app=app,
         payment=order.get_last_payment(),
-        lines_data=order_lines_info,
     )
-
-    transaction.on_commit(
-        lambda: order_created(
-            order_info=order_info,
-            user=user,
-            app=app,
-            manager=manager,
-            site_settings=site_settings,
-        )
-    )
-
-    # Send the order confirmation email
-    transaction.on_commit(
-        lambda: send_order_confirmation(order_info, checkout.redirect_url, manager)
-    )
-
     return order
 
 
@@ -960,18 +997,22 @@ def _is_refund_ongoing(payment):
 
 
 def _increase_voucher_usage(checkout_info: "CheckoutInfo"):
-    """Increase a voucher usage applied to the checkout."""
-    voucher = get_voucher_for_checkout_info(checkout_info, with_lock=True)
+    """Increase a voucher usage applied to the checkout.
+
+    :raises NotApplicable: When the voucher usage limit has been reached.
+    """
+    voucher = get_voucher_for_checkout_info(checkout_info)
     if not voucher:
         return None
 
+    if voucher.usage_limit and not increase_voucher_usage_within_limit(voucher):
+        msg = "Voucher usage limit reached in meantime. Order placement aborted."
+        raise NotApplicable(msg)
+
     if voucher.apply_once_per_customer:
         customer_email = cast(str, checkout_info.get_customer_email())
         add_voucher_usage_by_customer(voucher, customer_email)
 
-    if voucher.usage_limit:
-        increase_voucher_usage(voucher)
-
 
 def _create_order_lines_from_checkout_lines(
     checkout_info: CheckoutInfo,
@@ -986,19 +1027,20 @@ def _create_order_lines_from_checkout_lines(
         lines,
         prices_entered_with_tax,
     )
-    order_lines = []
-    order_line_discounts: List["OrderLineDiscount"] = []
+    order_lines: List[OrderLine] = []
+    order_line_discounts: List[OrderLineDiscount] = []
     for line_info in order_lines_info:
         line = line_info.line
         line.order_id = order_pk
         order_lines.append(line)
-        if discounts := line_info.line_discounts:
-            order_line_discounts.extend(discounts)
+        order_line_discounts.extend(line_info.line_discounts or ())
 
-    OrderLine.objects.bulk_create(order_lines)
-    OrderLineDiscount.objects.bulk_create(order_line_discounts)
+    OrderLine.objects.bulk_create(order_lines, batch_size=ORDER_LINES_BATCH_SIZE)
+    OrderLineDiscount.objects.bulk_create(
+        order_line_discounts, batch_size=ORDER_LINES_BATCH_SIZE
+    )
 
-    return list(order_lines_info)
+    return order_lines_info
 
 
 def _handle_allocations_of_order_lines(
@@ -1007,26 +1049,26 @@ def _handle_allocations_of_order_lines(
     order_lines_info: List[OrderLineInfo],
     manager: "PluginsManager",
     reservation_enabled: bool,
+    country_code: str,
+    collection_point_pk: Optional[UUID],
+    additional_warehouse_lookup: Dict[str, Any],
 ):
-    country_code = checkout_info.get_country()
-    additional_warehouse_lookup = (
-        checkout_info.delivery_method_info.get_warehouse_filter_lookup()
-    )
+    raw_checkout_lines = [line_info.line for line_info in checkout_lines]
     allocate_stocks(
         order_lines_info,
         country_code,
         checkout_info.channel,
         manager,
-        checkout_info.delivery_method_info.warehouse_pk,
+        collection_point_pk,
         additional_warehouse_lookup,
         check_reservations=True,
-        checkout_lines=[line.line for line in checkout_lines],
+        checkout_lines=raw_checkout_lines,
     )
     allocate_preorders(
         order_lines_info,
         checkout_info.channel.slug,
         check_reservations=reservation_enabled,
-        checkout_lines=[line.line for line in checkout_lines],
+        checkout_lines=raw_checkout_lines,
     )
 
 
@@ -1047,37 +1089,66 @@ def _handle_checkout_discount(order: "Order", checkout: "Checkout"):
         )
 
 
+def _move_checkout_payments_to_order(checkout: "Checkout", order: "Order") -> bool:
+    """Assign the checkout payments and transaction items to the order.
+
+    Both tables are updated within a single statement to save a round-trip to
+    the database. Return whether any payment or transaction item was moved.
+    """
+    payment_table = Payment._meta.db_table
+    transaction_item_table = TransactionItem._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH moved_payments AS (
+                UPDATE {payment_table}
+                SET order_id = %(order_id)s, checkout_id = NULL
+                WHERE checkout_id = %(checkout_id)s
+                RETURNING id
+            ), moved_transaction_items AS (
+                UPDATE {transaction_item_table}
+                SET order_id = %(order_id)s, checkout_id = NULL
+                WHERE checkout_id = %(checkout_id)s
+                RETURNING id
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM moved_payments)
+                OR EXISTS (SELECT 1 FROM moved_transaction_items)
+            """,
+            {"order_id": order.pk, "checkout_id": checkout.pk},
+        )
+        return cursor.fetchone()[0]
+
+
 def _post_create_order_actions(
     order: "Order",
     checkout_info: "CheckoutInfo",
-    order_lines_info: List["OrderLineInfo"],
-    manager: "PluginsManager",
     user: Optional[User],
     app: Optional["App"],
-    site_settings: "SiteSettings",
+    payment: Optional[Payment],
 ):
-    order_info = OrderInfo(
-        order=order,
-        customer_email=order.user_email,
-        channel=checkout_info.channel,
-        payment=order.get_last_payment(),
-        lines_data=order_lines_info,
-    )
-
+    # The search vector is not needed to complete the checkout, it is set after
+    # the commit to keep the transaction short.
+    transaction.on_commit(lambda: update_order_search_vector_task.delay(order.pk))
+
+    # Run the plugins and send the notifications outside of the request, only the
+    # ids are passed, the tasks fetch the order data on their own.
+    # The payment is resolved by the caller, as the payments added to the order
+    # after its creation must not be taken into account by the order created actions.
+    user_id = user.pk if user else None
+    app_id = app.pk if app else None
+    payment_id = payment.pk if payment else None
     transaction.on_commit(
-        lambda: order_created(
-            order_info=order_info,
-            user=user,
-            app=app,
-            manager=manager,
-            site_settings=site_settings,
+        lambda: order_created_task.delay(
+            order.pk, user_id=user_id, app_id=app_id, payment_id=payment_id
         )
     )
 
     # Send the order confirmation email
+    redirect_url = checkout_info.checkout.redirect_url
     transaction.on_commit(
-        lambda: send_order_confirmation(
-            order_info, checkout_info.checkout.redirect_url, manager
+        lambda: send_order_confirmation_task.delay(
+            order.pk, redirect_url, user_id=user_id, app_id=app_id
         )
     )
 
@@ -1088,46 +1159,39 @@ def _create_order_from_checkout(
     manager: "PluginsManager",
     user: Optional[User],
     app: Optional["App"],
+    site_settings: "SiteSettings",
     metadata_list: Optional[List] = None,
     private_metadata_list: Optional[List] = None,
 ):
     from ..order.utils import add_gift_cards_to_order
 
-    site_settings = Site.objects.get_current().settings
-
     address = checkout_info.shipping_address or checkout_info.billing_address
+    country_code = checkout_info.get_country()
+    delivery_method_info = checkout_info.delivery_method_info
+    additional_warehouse_lookup = delivery_method_info.get_warehouse_filter_lookup()
 
     reservation_enabled = is_reservation_enabled(site_settings)
     tax_configuration = checkout_info.tax_configuration
     prices_entered_with_tax = tax_configuration.prices_entered_with_tax
 
-    # total
-    taxed_total = calculations.calculate_checkout_total_with_gift_cards(
+    # total and shipping
+    (
+        taxed_total,
+        _,
+        shipping_total,
+        shipping_tax_rate,
+    ) = calculations.checkout_prices_bulk(
         manager=manager,
         checkout_info=checkout_info,
         lines=checkout_lines_info,
         address=address,
     )
-
-    # voucher
-    voucher = checkout_info.voucher
-
-    # shipping
     base_shipping_price = base_checkout_delivery_price(
         checkout_info, checkout_lines_info
     )
-    shipping_total = calculations.checkout_shipping_price(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=checkout_lines_info,
-        address=address,
-    )
-    shipping_tax_rate = calculations.checkout_shipping_tax_rate(
-        manager=manager,
-        checkout_info=checkout_info,
-        lines=checkout_lines_info,
-        address=address,
-    )
+
+    # voucher
+    voucher = checkout_info.voucher
 
     # status
     status = (
@@ -1138,42 +1202,43 @@ def _create_order_from_checkout(
         )
         else OrderStatus.UNCONFIRMED
     )
-    checkout_metadata = get_or_create_checkout_metadata(checkout_info.checkout)
+    checkout_metadata = get_checkout_metadata(checkout_info.checkout)
 
-    # update metadata
+    # copy metadata from the checkout into the new order
+    metadata = dict(checkout_metadata.metadata or {})
     if metadata_list:
-        checkout_metadata.store_value_in_metadata(
-            {data.key: data.value for data in metadata_list}
-        )
+        metadata.update((data.key, data.value) for data in metadata_list)
+    private_metadata = dict(checkout_metadata.private_metadata or {})
     if private_metadata_list:
-        checkout_metadata.store_value_in_private_metadata(
-            {data.key: data.value for data in private_metadata_list}
+        private_metadata.update(
+            (data.key, data.value) for data in private_metadata_list
         )
 
     # order
-    order = Order.objects.create(  # type: ignore[misc] # see below:
+    order_data = _process_shipping_data_for_order(
+        checkout_info,
+        base_shipping_price,
+        shipping_total,
+        manager,
+        checkout_lines_info,
+    )
+    order_data.update(_process_user_data_for_order(checkout_info, manager))
+    order_data.update(
         status=status,
         language_code=checkout_info.checkout.language_code,
-        total=taxed_total,  # money field not supported by mypy_django_plugin
+        total=taxed_total,
         shipping_tax_rate=shipping_tax_rate,
         voucher=voucher,
         checkout_token=str(checkout_info.checkout.token),
         origin=OrderOrigin.CHECKOUT,
         channel=checkout_info.channel,
-        metadata=checkout_metadata.metadata,
-        private_metadata=checkout_metadata.private_metadata,
+        metadata=metadata,
+        private_metadata=private_metadata,
         redirect_url=checkout_info.checkout.redirect_url,
         should_refresh_prices=False,
         tax_exemption=checkout_info.checkout.tax_exemption,
-        **_process_shipping_data_for_order(
-            checkout_info,
-            base_shipping_price,
-            shipping_total,
-            manager,
-            checkout_lines_info,
-        ),
-        **_process_user_data_for_order(checkout_info, manager),
     )
+    order = Order.objects.create(**order_data)
 
     # checkout discount
     _handle_checkout_discount(order, checkout_info.checkout)
@@ -1189,19 +1254,12 @@ def _create_order_from_checkout(
 
     # update undiscounted order total
     undiscounted_total = (
-        sum(
-            [line.line.undiscounted_total_price for line in order_lines_info],
-            start=zero_taxed_money(taxed_total.currency),
+        _sum_order_lines_price(
+            order_lines_info, "undiscounted_total_price", taxed_total.currency
         )
         + shipping_total
     )
     order.undiscounted_total = undiscounted_total
-    order.save(
-        update_fields=[
-            "undiscounted_total_net_amount",
-            "undiscounted_total_gross_amount",
-        ]
-    )
 
     # allocations
     _handle_allocations_of_order_lines(
@@ -1210,45 +1268,70 @@ def _create_order_from_checkout(
         order_lines_info=order_lines_info,
         manager=manager,
         reservation_enabled=reservation_enabled,
+        country_code=country_code,
+        collection_point_pk=delivery_method_info.warehouse_pk,
+        additional_warehouse_lookup=additional_warehouse_lookup,
     )
 
     # giftcards
     currency = checkout_info.checkout.currency
-    subtotal_list = [line.line.total_price for line in order_lines_info]
-    subtotal = sum(subtotal_list, zero_taxed_money(currency))
+    subtotal = _sum_order_lines_price(order_lines_info, "total_price", currency)
     total_without_giftcard = subtotal + shipping_total - checkout_info.checkout.discount
     add_gift_cards_to_order(
         checkout_info, order, total_without_giftcard.gross, user, app
     )
 
     # payments
-    checkout_info.checkout.payments.update(order=order, checkout_id=None)
-    checkout_info.checkout.payment_transactions.update(order=order, checkout_id=None)
-    update_order_charge_data(order, with_save=False)
-    update_order_authorize_data(order, with_save=False)
+    payment = None
+    if _move_checkout_payments_to_order(checkout_info.checkout, order):
+        updates_amounts_for_order(order, save=False)
+        payment = order.get_last_payment()
+    else:
+        # nothing was paid for the new order, only the statuses need to be set
+        update_order_charge_status(order, granted_refund_amount=Decimal(0))
+        update_order_authorize_status(order, granted_refund_amount=Decimal(0))
 
     # tax settings
     update_order_display_gross_prices(order)
 
-    # order search
-    order.search_vector = FlatConcatSearchVector(
-        *prepare_order_search_vector_value(order)
+    order.save(
+        update_fields=[
+            "undiscounted_total_net_amount",
+            "undiscounted_total_gross_amount",
+            "total_charged_amount",
+            "charge_status",
+            "total_authorized_amount",
+            "authorize_status",
+            "display_gross_prices",
+            "updated_at",
+        ]
     )
-    order.save()
 
     # post create actions
     _post_create_order_actions(
         order=order,
         checkout_info=checkout_info,
-        order_lines_info=order_lines_info,
-        manager=manager,
         user=user,
         app=app,
-        site_settings=site_settings,
+        payment=payment,
     )
     return order
 
 
+def _get_checkout_for_update(checkout_pk: UUID) -> Optional[Checkout]:
+    """Return the checkout locked for update, or None if it doesn't exist anymore.
+
+    The channel and its tax configuration are fetched along with the checkout, as
+    both are needed to fetch the checkout info. Only the checkout row is locked.
+    """
+    return (
+        Checkout.objects.select_for_update(of=("self",))
+        .select_related("channel__tax_configuration")
+        .filter(pk=checkout_pk)
+        .first()
+    )
+
+
 def create_order_from_checkout(
     checkout_info: CheckoutInfo,
     manager: "PluginsManager",
@@ -1257,6 +1340,7 @@ def create_order_from_checkout(
     delete_checkout: bool = True,
     metadata_list: Optional[List] = None,
     private_metadata_list: Optional[List] = None,
+    site_settings: Optional["SiteSettings"] = None,
 ) -> Order:
     """Crate order from checkout.
 
@@ -1275,15 +1359,14 @@ def create_order_from_checkout(
 
     :raises: InsufficientStock, GiftCardNotApplicable
     """
+    if site_settings is None:
+        site_settings = Site.objects.get_current().settings
 
-    voucher = None
-    if voucher := checkout_info.voucher:
-        with transaction.atomic():
-            _increase_voucher_usage(checkout_info=checkout_info)
+    voucher = checkout_info.voucher
 
     with transaction.atomic():
         checkout_pk = checkout_info.checkout.pk
-        checkout = Checkout.objects.select_for_update().filter(pk=checkout_pk).first()
+        checkout = _get_checkout_for_update(checkout_pk)
         if not checkout:
             order = Order.objects.get_by_checkout_token(checkout_pk)
             return order
@@ -1296,29 +1379,25 @@ def create_order_from_checkout(
         )
         assign_checkout_user(user, checkout_info)
 
-        try:
-            order = _create_order_from_checkout(
-                checkout_info=checkout_info,
-                checkout_lines_info=list(checkout_lines),
-                manager=manager,
-                user=user,
-                app=app,
-                metadata_list=metadata_list,
-                private_metadata_list=private_metadata_list,
-            )
-            if delete_checkout:
-                checkout_info.checkout.delete()
-            return order
-        except InsufficientStock:
-            release_voucher_usage(
-                checkout_info.voucher, checkout_info.checkout.get_customer_email()
-            )
-            raise
-        except GiftCardNotApplicable:
-            release_voucher_usage(
-                checkout_info.voucher, checkout_info.checkout.get_customer_email()
-            )
-            raise
+        # The voucher usage is increased under the checkout lock, so a repeated
+        # request can't use the voucher again, and it is rolled back together with
+        # the order when the order can't be created.
+        if voucher:
+            _increase_voucher_usage(checkout_info=checkout_info)
+
+        order = _create_order_from_checkout(
+            checkout_info=checkout_info,
+            checkout_lines_info=list(checkout_lines),
+            manager=manager,
+            user=user,
+            app=app,
+            site_settings=site_settings,
+            metadata_list=metadata_list,
+            private_metadata_list=private_metadata_list,
+        )
+        if delete_checkout:
+            checkout_info.checkout.delete()
+        return order
 
 
 def assign_checkout_user(
@@ -1374,6 +1453,7 @@ def complete_checkout(
             redirect_url=redirect_url,
             metadata_list=metadata_list,
             private_metadata_list=private_metadata_list,
+            site_settings=site_settings,
         )
         return order, False, {}
 
@@ -1400,6 +1480,7 @@ def complete_checkout_with_transaction(
     redirect_url: Optional[str] = None,
     metadata_list: Optional[List] = None,
     private_metadata_list: Optional[List] = None,
+    site_settings: Optional["SiteSettings"] = None,
 ) -> Optional[Order]:
     try:
         _prepare_checkout_with_transactions(
@@ -1417,6 +1498,7 @@ def complete_checkout_with_transaction(
             delete_checkout=True,
             metadata_list=metadata_list,
             private_metadata_list=private_metadata_list,
+            site_settings=site_settings,
         )
     except NotApplicable:
         raise ValidationError(
@@ -1452,8 +1534,12 @@ def complete_checkout_with_payment(
     for thread race.
     :raises ValidationError
     """
+    # resolve the site settings once, they are used by both transaction blocks
+    if site_settings is None:
+        site_settings = Site.objects.get_current().settings
+
     with transaction_with_commit_on_errors():
-        checkout = Checkout.objects.select_for_update().filter(pk=checkout_pk).first()
+        checkout = _get_checkout_for_update(checkout_pk)
         if not checkout:
             order = Order.objects.get_by_checkout_token(checkout_pk)
             return order, False, {}
@@ -1502,11 +1588,7 @@ def complete_checkout_with_payment(
             )
 
     with transaction_with_commit_on_errors():
-        checkout = (
-            Checkout.objects.select_for_update()
-            .filter(pk=checkout_info.checkout.pk)
-            .first()
-        )
+        checkout = _get_checkout_for_update(checkout_info.checkout.pk)
         if not checkout:
             order = Order.objects.get_by_checkout_token(checkout_info.checkout.token)
             return order, False, {}
@@ -1551,17 +1633,16 @@ def _reserve_stocks_without_availability_check(
     )
     variants_stocks_map = {stock.product_variant_id: stock for stock in stocks}
 
-    reservations = []
-    for line in lines:
-        if line.variant.id in variants_stocks_map:
-            reservations.append(
-                Reservation(
-                    quantity_reserved=line.line.quantity,
-                    reserved_until=timezone.now()
-                    + timedelta(seconds=settings.RESERVE_DURATION),
-                    stock=variants_stocks_map[line.variant.id],
-                    checkout_line=line.line,
-                )
-            )
-    Reservation.objects.bulk_create(reservations)
+    reserved_until = timezone.now() + timedelta(seconds=settings.RESERVE_DURATION)
+    reservations = [
+        Reservation(
+            quantity_reserved=line.line.quantity,
+            reserved_until=reserved_until,
+            stock=variants_stocks_map[line.variant.id],
+            checkout_line=line.line,
+        )
+        for line in lines
+        if line.variant.id in variants_stocks_map
+    ]
+    Reservation.objects.bulk_create(reservations, batch_size=RESERVATIONS_BATCH_SIZE)
     return reservations
@@ -20,6 +20,15 @@ from ..base_calculations import (
 from ..calculations import (
     _apply_tax_data,
     _get_checkout_base_prices,
+    calculate_checkout_total_with_gift_cards,
+    checkout_line_tax_rate,
+    checkout_line_total,
+    checkout_line_unit_price,
+    checkout_lines_totals_bulk,
+    checkout_prices_bulk,
+    checkout_shipping_price,
+    checkout_shipping_tax_rate,
+    checkout_subtotal,
     fetch_checkout_data,
 )
 from ..fetch import CheckoutLineInfo, fetch_checkout_info, fetch_checkout_lines
@@ -481,3 +490,55 @@ def test_fetch_checkout_prices_when_tax_exemption_and_not_include_taxes_in_price
 
     assert checkout.total == shipping_price + all_lines_total_price
     assert checkout.subtotal == all_lines_total_price
+
+
+def test_checkout_lines_totals_bulk(checkout_with_items, plugins_manager):
+    # given
+    checkout = checkout_with_items
+    lines_info, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines_info, plugins_manager)
+    kwargs = {
+        "manager": plugins_manager,
+        "checkout_info": checkout_info,
+        "lines": lines_info,
+    }
+
+    # when
+    lines_prices = checkout_lines_totals_bulk(**kwargs)
+
+    # then
+    assert len(lines_prices) == len(lines_info)
+    for line_info in lines_info:
+        total_price, unit_price, tax_rate = lines_prices[line_info.line.pk]
+        assert total_price == checkout_line_total(
+            checkout_line_info=line_info, **kwargs
+        )
+        assert unit_price == checkout_line_unit_price(
+            checkout_line_info=line_info, **kwargs
+        )
+        assert tax_rate == checkout_line_tax_rate(
+            checkout_line_info=line_info, **kwargs
+        )
+
+
+def test_checkout_prices_bulk(checkout_with_items, plugins_manager):
+    # given
+    checkout = checkout_with_items
+    lines_info, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines_info, plugins_manager)
+    address = checkout.shipping_address
+    kwargs = {
+        "manager": plugins_manager,
+        "checkout_info": checkout_info,
+        "lines": lines_info,
+        "address": address,
+    }
+
+    # when
+    total, subtotal, shipping_price, shipping_tax_rate = checkout_prices_bulk(**kwargs)
+
+    # then
+    assert total == calculate_checkout_total_with_gift_cards(**kwargs)
+    assert subtotal == checkout_subtotal(**kwargs)
+    assert shipping_price == checkout_shipping_price(**kwargs)
+    assert shipping_tax_rate == checkout_shipping_tax_rate(**kwargs)
@@ -887,7 +887,7 @@ def test_create_order_gift_card_bought(
         checkout_user,
         order.user_email,
         gift_card,
-        manager,
+        mock.ANY,
         order.channel.slug,
         resending=False,
     )
@@ -1861,6 +1861,7 @@ def test_checkout_complete_pick_transaction_flow(
         redirect_url=None,
         metadata_list=None,
         private_metadata_list=None,
+        site_settings=None,
     )
 
 
@@ -1911,6 +1912,7 @@ def test_checkout_complete_pick_transaction_flow_when_checkout_total_zero(
         redirect_url=None,
         metadata_list=None,
         private_metadata_list=None,
+        site_settings=None,
     )
 
 
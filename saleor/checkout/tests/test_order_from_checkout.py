@@ -6,11 +6,13 @@ import pytest
 from django.test import override_settings
 from prices import TaxedMoney
 
-from ...checkout.models import Checkout, CheckoutLine
+from ...checkout.models import Checkout, CheckoutLine, CheckoutMetadata
 from ...core.exceptions import InsufficientStock
 from ...core.taxes import zero_money, zero_taxed_money
+from ...discount.models import NotApplicable, Voucher
 from ...giftcard import GiftCardEvents
 from ...giftcard.models import GiftCard, GiftCardEvent
+from ...order import OrderAuthorizeStatus, OrderChargeStatus
 from ...plugins.manager import get_plugins_manager
 from ...product.models import ProductTranslation, ProductVariantTranslation
 from ...tests.utils import flush_post_commit_hooks
@@ -353,7 +355,7 @@ def test_create_order_gift_card_bought(
         checkout_user,
         order.user_email,
         gift_card,
-        manager,
+        mock.ANY,
         order.channel.slug,
         resending=False,
     )
@@ -490,6 +492,69 @@ def test_note_in_created_order(
     assert order.customer_note == checkout_with_item.note
 
 
+def test_create_order_from_checkout_metadata(
+    checkout_with_item, address, shipping_method, app
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.billing_address = address
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    checkout.metadata_storage.store_value_in_metadata({"checkout": "value"})
+    checkout.metadata_storage.save(update_fields=["metadata"])
+    manager = get_plugins_manager()
+
+    checkout_lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, checkout_lines, manager)
+
+    # when
+    order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+        metadata_list=[mock.Mock(key="order", value="value")],
+        private_metadata_list=[mock.Mock(key="private", value="value")],
+    )
+
+    # then
+    assert order.metadata == {"checkout": "value", "order": "value"}
+    assert order.private_metadata == {"private": "value"}
+
+
+def test_create_order_from_checkout_without_metadata_storage(
+    checkout_with_item, address, shipping_method, app
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.billing_address = address
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    checkout.metadata_storage.delete()
+    checkout = Checkout.objects.get(pk=checkout.pk)
+    manager = get_plugins_manager()
+
+    checkout_lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, checkout_lines, manager)
+
+    # when
+    order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+        delete_checkout=False,
+        metadata_list=[mock.Mock(key="order", value="value")],
+    )
+
+    # then
+    assert order.metadata == {"order": "value"}
+    assert order.private_metadata == {}
+    assert not CheckoutMetadata.objects.filter(checkout=checkout).exists()
+
+
 @override_settings(LANGUAGE_CODE="fr")
 def test_create_order_use_translations(
     checkout_with_item, customer_user, shipping_method, app
@@ -604,6 +669,36 @@ def test_create_order_from_checkout_updates_total_charged_amount(
     assert order.total_charged_amount == charged_value
 
 
+def test_create_order_from_checkout_without_payments(
+    checkout_with_item, address, customer_user, shipping_method, app
+):
+    # given
+    checkout_with_item.shipping_address = address
+    checkout_with_item.billing_address = address
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.redirect_url = "https://www.example.com"
+    checkout_with_item.save()
+    manager = get_plugins_manager()
+
+    checkout_lines, unavailable_variant_pks = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(checkout_with_item, checkout_lines, manager)
+
+    # when
+    order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+    )
+
+    # then
+    order.refresh_from_db()
+    assert order.total_charged_amount == Decimal(0)
+    assert order.total_authorized_amount == Decimal(0)
+    assert order.charge_status == OrderChargeStatus.NONE
+    assert order.authorize_status == OrderAuthorizeStatus.NONE
+
+
 def test_create_order_from_checkout_update_display_gross_prices(
     checkout_with_item, app
 ):
@@ -743,8 +838,8 @@ def test_note_in_created_order_checkout_line_deleted_in_the_meantime(
         CheckoutLine.objects.get(id=checkout_with_item.lines.first().id).delete()
 
     # when
-    with before_after.after(
-        "saleor.checkout.complete_checkout._increase_voucher_usage",
+    with before_after.before(
+        "saleor.checkout.complete_checkout._get_checkout_for_update",
         delete_checkout_line,
     ):
         order = create_order_from_checkout(
@@ -778,8 +873,121 @@ def test_note_in_created_order_checkout_deleted_in_the_meantime(
         Checkout.objects.get(pk=checkout_with_item.pk).delete()
 
     # when
-    with before_after.after(
-        "saleor.checkout.complete_checkout._increase_voucher_usage",
+    with before_after.before(
+        "saleor.checkout.complete_checkout._get_checkout_for_update",
+        delete_checkout,
+    ):
+        order = create_order_from_checkout(
+            checkout_info=checkout_info,
+            manager=manager,
+            user=None,
+            app=app,
+        )
+
+    # then
+    assert order is None
+
+
+def test_create_order_voucher_usage_limit_reached_in_the_meantime(
+    checkout_with_item, address, shipping_method, app, voucher_percentage
+):
+    # given
+    voucher_percentage.usage_limit = 1
+    voucher_percentage.used = 0
+    voucher_percentage.save(update_fields=["usage_limit", "used"])
+
+    checkout_with_item.voucher_code = voucher_percentage.code
+    checkout_with_item.shipping_address = address
+    checkout_with_item.billing_address = address
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    manager = get_plugins_manager()
+
+    checkout_lines, _ = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(checkout_with_item, checkout_lines, manager)
+
+    def use_voucher(*args, **kwargs):
+        Voucher.objects.filter(pk=voucher_percentage.pk).update(used=1)
+
+    # when
+    with before_after.before(
+        "saleor.checkout.complete_checkout.increase_voucher_usage_within_limit",
+        use_voucher,
+    ):
+        with pytest.raises(NotApplicable):
+            create_order_from_checkout(
+                checkout_info=checkout_info,
+                manager=manager,
+                user=None,
+                app=app,
+            )
+
+    # then
+    assert Checkout.objects.filter(pk=checkout_with_item.pk).exists()
+
+
+def test_create_order_from_already_completed_checkout_with_voucher(
+    checkout_with_item, address, shipping_method, app, voucher_percentage
+):
+    # given
+    voucher_percentage.usage_limit = 5
+    voucher_percentage.used = 0
+    voucher_percentage.save(update_fields=["usage_limit", "used"])
+
+    checkout_with_item.voucher_code = voucher_percentage.code
+    checkout_with_item.shipping_address = address
+    checkout_with_item.billing_address = address
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    manager = get_plugins_manager()
+
+    checkout_lines, _ = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(checkout_with_item, checkout_lines, manager)
+    order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+    )
+
+    # when
+    repeated_order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+    )
+
+    # then
+    assert repeated_order == order
+    voucher_percentage.refresh_from_db()
+    assert voucher_percentage.used == 1
+
+
+def test_create_order_from_checkout_with_voucher_checkout_deleted_in_the_meantime(
+    checkout_with_item, address, shipping_method, app, voucher_percentage
+):
+    # given
+    voucher_percentage.usage_limit = 5
+    voucher_percentage.used = 0
+    voucher_percentage.save(update_fields=["usage_limit", "used"])
+
+    checkout_with_item.voucher_code = voucher_percentage.code
+    checkout_with_item.shipping_address = address
+    checkout_with_item.billing_address = address
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    manager = get_plugins_manager()
+
+    checkout_lines, _ = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(checkout_with_item, checkout_lines, manager)
+
+    def delete_checkout(*args, **kwargs):
+        Checkout.objects.get(pk=checkout_with_item.pk).delete()
+
+    # when
+    with before_after.before(
+        "saleor.checkout.complete_checkout._get_checkout_for_update",
         delete_checkout,
     ):
         order = create_order_from_checkout(
@@ -791,6 +999,49 @@ def test_note_in_created_order_checkout_deleted_in_the_meantime(
 
     # then
     assert order is None
+    voucher_percentage.refresh_from_db()
+    assert voucher_percentage.used == 0
+
+
+def test_create_order_from_checkout_with_voucher_without_deleting_checkout(
+    checkout_with_item, address, shipping_method, app, voucher_percentage
+):
+    # given
+    voucher_percentage.usage_limit = 5
+    voucher_percentage.used = 0
+    voucher_percentage.save(update_fields=["usage_limit", "used"])
+
+    checkout_with_item.voucher_code = voucher_percentage.code
+    checkout_with_item.shipping_address = address
+    checkout_with_item.billing_address = address
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    manager = get_plugins_manager()
+
+    checkout_lines, _ = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(checkout_with_item, checkout_lines, manager)
+    order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+        delete_checkout=False,
+    )
+
+    # when
+    next_order = create_order_from_checkout(
+        checkout_info=checkout_info,
+        manager=manager,
+        user=None,
+        app=app,
+        delete_checkout=False,
+    )
+
+    # then
+    assert next_order != order
+    assert Checkout.objects.filter(pk=checkout_with_item.pk).exists()
+    voucher_percentage.refresh_from_db()
+    assert voucher_percentage.used == 2
 
 
 def test_create_order_product_on_promotion(
@@ -515,7 +515,6 @@ def _get_products_voucher_discount(
 def get_voucher_for_checkout(
     checkout: "Checkout",
     channel_slug: str,
-    with_lock: bool = False,
     with_prefetch: bool = False,
 ) -> Optional[Voucher]:
     """Return voucher assigned to checkout."""
@@ -529,25 +528,20 @@ def get_voucher_for_checkout(
                 "products", "collections", "categories", "variants", "channel_listings"
             )
         try:
-            qs = vouchers
-            voucher = qs.get(code=checkout.voucher_code)
-            if voucher and voucher.usage_limit is not None and with_lock:
-                voucher = vouchers.select_for_update().get(code=checkout.voucher_code)
-            return voucher
+            return vouchers.get(code=checkout.voucher_code)
         except Voucher.DoesNotExist:
             return None
     return None
 
 
 def get_voucher_for_checkout_info(
-    checkout_info: "CheckoutInfo", with_lock: bool = False, with_prefetch: bool = False
+    checkout_info: "CheckoutInfo", with_prefetch: bool = False
 ) -> Optional[Voucher]:
     """Return voucher with voucher code saved in checkout if active or None."""
     checkout = checkout_info.checkout
     return get_voucher_for_checkout(
         checkout,
         channel_slug=checkout_info.channel.slug,
-        with_lock=with_lock,
         with_prefetch=with_prefetch,
     )
 
@@ -14,7 +14,7 @@ from ..utils import (
     decrease_voucher_usage,
     get_discount_name,
     get_discount_translated_name,
-    increase_voucher_usage,
+    increase_voucher_usage_within_limit,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -181,21 +181,36 @@ def test_voucher_queryset_active_in_other_channel(voucher, channel_PLN):
     assert active_vouchers.count() == 0
 
 
-def test_increase_voucher_usage(channel_USD):
+def test_increase_voucher_usage_within_limit(channel_USD):
     voucher = Voucher.objects.create(
         code="unique",
         type=VoucherType.ENTIRE_ORDER,
         discount_value_type=DiscountValueType.FIXED,
         usage_limit=100,
+        used=10,
     )
-    VoucherChannelListing.objects.create(
-        voucher=voucher,
-        channel=channel_USD,
-        discount=Money(10, channel_USD.currency_code),
+
+    result = increase_voucher_usage_within_limit(voucher)
+
+    voucher.refresh_from_db()
+    assert result is True
+    assert voucher.used == 11
+
+
+def test_increase_voucher_usage_within_limit_limit_reached(channel_USD):
+    voucher = Voucher.objects.create(
+        code="unique",
+        type=VoucherType.ENTIRE_ORDER,
+        discount_value_type=DiscountValueType.FIXED,
+        usage_limit=10,
+        used=10,
     )
-    increase_voucher_usage(voucher)
+
+    result = increase_voucher_usage_within_limit(voucher)
+
     voucher.refresh_from_db()
-    assert voucher.used == 1
+    assert result is False
+    assert voucher.used == 10
 
 
 def test_decrease_voucher_usage(channel_USD):
@@ -216,6 +231,20 @@ def test_decrease_voucher_usage(channel_USD):
     assert voucher.used == 9
 
 
+def test_decrease_voucher_usage_not_below_zero(voucher):
+    # given
+    voucher.usage_limit = 100
+    voucher.used = 0
+    voucher.save(update_fields=["usage_limit", "used"])
+
+    # when
+    decrease_voucher_usage(voucher)
+
+    # then
+    voucher.refresh_from_db()
+    assert voucher.used == 0
+
+
 def test_add_voucher_usage_by_customer(voucher, customer_user):
     voucher_customer_count = VoucherCustomer.objects.all().count()
     add_voucher_usage_by_customer(voucher, customer_user.email)
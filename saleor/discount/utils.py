@@ -32,6 +32,7 @@ from .models import (
     NotApplicable,
     Promotion,
     PromotionRule,
+    Voucher,
 )
 
 if TYPE_CHECKING:
@@ -45,22 +46,31 @@ if TYPE_CHECKING:
         ProductVariantChannelListing,
         VariantChannelListingPromotionRule,
     )
-    from .models import Voucher
 
 CatalogueInfo = DefaultDict[str, Set[Union[int, str]]]
 CATALOGUE_FIELDS = ["categories", "collections", "products", "variants"]
 
 
-def increase_voucher_usage(voucher: "Voucher") -> None:
-    """Increase voucher uses by 1."""
-    voucher.used = F("used") + 1
-    voucher.save(update_fields=["used"])
+def increase_voucher_usage_within_limit(voucher: "Voucher") -> bool:
+    """Increase voucher uses by 1 if the usage limit is not reached.
+
+    The limit check and the increase are done in a single UPDATE, so the voucher
+    row doesn't have to be locked beforehand.
+    Return False when the voucher usage limit is already reached.
+    """
+    return bool(
+        Voucher.objects.filter(pk=voucher.pk, used__lt=F("usage_limit")).update(
+            used=F("used") + 1
+        )
+    )
 
 
 def decrease_voucher_usage(voucher: "Voucher") -> None:
-    """Decrease voucher uses by 1."""
-    voucher.used = F("used") - 1
-    voucher.save(update_fields=["used"])
+    """Decrease voucher uses by 1.
+
+    The usage is decreased in a single UPDATE, that never sets it below 0.
+    """
+    Voucher.objects.filter(pk=voucher.pk, used__gt=0).update(used=F("used") - 1)
 
 
 def add_voucher_usage_by_customer(voucher: "Voucher", customer_email: str) -> None:
@@ -72,11 +82,9 @@ def add_voucher_usage_by_customer(voucher: "Voucher", customer_email: str) -> No
 
 
 def remove_voucher_usage_by_customer(voucher: "Voucher", customer_email: str) -> None:
-    voucher_customer = VoucherCustomer.objects.filter(
+    VoucherCustomer.objects.filter(
         voucher=voucher, customer_email=customer_email
-    )
-    if voucher_customer:
-        voucher_customer.delete()
+    ).delete()
 
 
 def release_voucher_usage(voucher: Optional["Voucher"], user_email: Optional[str]):
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.22 on 2023-10-16 09:12
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("order", "0174_order_idx_order_created_at"),
+    ]
+
+    atomic = False
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="order",
+            index=models.Index(
+                fields=["checkout_token"], name="idx_order_checkout_token"
+            ),
+        ),
+    ]
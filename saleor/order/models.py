@@ -348,6 +348,7 @@ class Order(ModelWithMetadata, ModelWithExternalReference):
                 opclasses=["gin_trgm_ops"],
             ),
             models.Index(fields=["created_at"], name="idx_order_created_at"),
+            models.Index(fields=["checkout_token"], name="idx_order_checkout_token"),
         ]
 
     def is_fully_paid(self):
@@ -1,22 +1,33 @@
 import logging
 from datetime import timedelta
-from typing import List
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+from uuid import UUID
 
+from django.contrib.sites.models import Site
 from django.db.models import Exists, F, Func, OuterRef, Subquery, Value
 from django.utils import timezone
 
+from ..account.models import User
+from ..app.models import App
 from ..celeryconf import app
 from ..channel.models import Channel
 from ..core.tracing import traced_atomic_transaction
 from ..core.utils.events import call_event
 from ..discount.models import Voucher, VoucherCustomer
 from ..payment.models import Payment, TransactionItem
-from ..plugins.manager import get_plugins_manager
+from ..plugins.manager import PluginsManager, get_plugins_manager
 from ..warehouse.management import deallocate_stock_for_orders
 from . import OrderEvents, OrderStatus
+from .actions import order_created
+from .fetch import OrderInfo, fetch_order_lines
 from .models import Order, OrderEvent
+from .notifications import send_order_confirmation
+from .search import update_order_search_vector
 from .utils import invalidate_order_prices
 
+if TYPE_CHECKING:
+    from ..core.middleware import Requestor
+
 logger = logging.getLogger(__name__)
 
 # Batch size of 100 is about ~1MB of memory usage in task
@@ -44,6 +55,86 @@ def send_order_updated(order_ids):
         manager.order_updated(order)
 
 
+def _get_requestor_getter(requestor: "Requestor") -> Callable[[], "Requestor"]:
+    return lambda: requestor
+
+
+def _get_order_requestor_data(
+    user_id: Optional[int], app_id: Optional[int]
+) -> Tuple[Optional[User], Optional[App], PluginsManager]:
+    user = User.objects.filter(pk=user_id).first() if user_id else None
+    requestor_app = App.objects.filter(pk=app_id).first() if app_id else None
+    requestor = requestor_app or user
+    manager = get_plugins_manager(
+        _get_requestor_getter(requestor) if requestor else None, allow_replica=False
+    )
+    return user, requestor_app, manager
+
+
+@app.task
+def order_created_task(
+    order_id: UUID,
+    user_id: Optional[int] = None,
+    app_id: Optional[int] = None,
+    payment_id: Optional[int] = None,
+):
+    """Trigger the order created actions outside of the request.
+
+    The `payment_id` is the last order payment at the moment of the order creation,
+    payments added to the order later are not taken into account.
+    """
+    order = Order.objects.select_related("channel").filter(pk=order_id).first()
+    if not order:
+        return
+    user, requestor_app, manager = _get_order_requestor_data(user_id, app_id)
+    order_info = OrderInfo(
+        order=order,
+        customer_email=order.get_customer_email(),
+        channel=order.channel,
+        payment=Payment.objects.filter(pk=payment_id).first() if payment_id else None,
+        lines_data=fetch_order_lines(order),
+    )
+    order_created(
+        order_info=order_info,
+        user=user,
+        app=requestor_app,
+        manager=manager,
+        site_settings=Site.objects.get_current().settings,
+    )
+
+
+@app.task
+def send_order_confirmation_task(
+    order_id: UUID,
+    redirect_url: Optional[str],
+    user_id: Optional[int] = None,
+    app_id: Optional[int] = None,
+):
+    """Send the order confirmation notifications outside of the request."""
+    order = Order.objects.select_related("channel").filter(pk=order_id).first()
+    if not order:
+        return
+    _, _, manager = _get_order_requestor_data(user_id, app_id)
+    # the confirmation uses only the order, its customer email and channel
+    order_info = OrderInfo(
+        order=order,
+        customer_email=order.get_customer_email(),
+        channel=order.channel,
+        payment=None,
+        lines_data=[],
+    )
+    send_order_confirmation(order_info, redirect_url, manager)
+
+
+@app.task
+def update_order_search_vector_task(order_id: UUID):
+    """Set the order search vector outside of the order creation transaction."""
+    order = Order.objects.filter(pk=order_id).first()
+    if not order:
+        return
+    update_order_search_vector(order)
+
+
 def _bulk_release_voucher_usage(order_ids):
     voucher_orders = Order.objects.filter(
         voucher=OuterRef("pk"),
@@ -6,11 +6,20 @@ from django.utils import timezone
 from freezegun import freeze_time
 from mock import patch
 
+from ...core.notify_events import NotifyEventType
 from ...discount.models import VoucherCustomer
+from ...graphql.core.utils import to_global_id_or_none
+from ...tests.utils import flush_post_commit_hooks
 from ...warehouse.models import Allocation
 from .. import OrderEvents, OrderStatus
 from ..models import Order, OrderEvent, get_order_number
-from ..tasks import delete_expired_orders_task, expire_orders_task
+from ..tasks import (
+    delete_expired_orders_task,
+    expire_orders_task,
+    order_created_task,
+    send_order_confirmation_task,
+    update_order_search_vector_task,
+)
 
 
 def test_expire_orders_task_check_voucher(
@@ -605,3 +614,49 @@ def test_delete_expired_orders_task_schedule_itself(
     # then
     mocked_delay.assert_called_once_with()
     assert Order.objects.count() == 2
+
+
+@patch("saleor.plugins.manager.PluginsManager.order_created")
+def test_order_created_task(mocked_order_created, order_with_lines, customer_user):
+    # given
+    order = order_with_lines
+
+    # when
+    order_created_task(order.pk, user_id=customer_user.pk)
+
+    # then
+    flush_post_commit_hooks()
+    event = OrderEvent.objects.get(order=order, type=OrderEvents.PLACED)
+    assert event.user == customer_user
+    mocked_order_created.assert_called_once_with(order)
+
+
+@patch("saleor.plugins.manager.PluginsManager.notify")
+def test_send_order_confirmation_task(mocked_notify, order_with_lines):
+    # given
+    order = order_with_lines
+
+    # when
+    send_order_confirmation_task(order.pk, "https://www.example.com")
+
+    # then
+    mocked_notify.assert_called_once()
+    (event_type, payload), kwargs = mocked_notify.call_args
+    assert event_type == NotifyEventType.ORDER_CONFIRMATION
+    assert payload["recipient_email"] == order.get_customer_email()
+    assert payload["order"]["id"] == to_global_id_or_none(order)
+    assert kwargs["channel_slug"] == order.channel.slug
+
+
+def test_update_order_search_vector_task(order_with_lines):
+    # given
+    order = order_with_lines
+    order.search_vector = None
+    order.save(update_fields=["search_vector"])
+
+    # when
+    update_order_search_vector_task(order.pk)
+
+    # then
+    order.refresh_from_db()
+    assert order.search_vector
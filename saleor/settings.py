@@ -93,6 +93,12 @@ INTERNAL_IPS = get_list(os.environ.get("INTERNAL_IPS", "127.0.0.1"))
 # will be closed after each request.
 DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 600))
 
+# Server-side cursors do not work with connection poolers running in transaction
+# pooling mode (e.g. PgBouncer), set this to True when using such a pooler.
+DB_DISABLE_SERVER_SIDE_CURSORS = get_bool_from_env(
+    "DB_DISABLE_SERVER_SIDE_CURSORS", False
+)
+
 DATABASE_CONNECTION_DEFAULT_NAME = "default"
 # TODO: For local envs will be activated in separate PR.
 # We need to update docs an saleor platform.
@@ -112,6 +118,8 @@ DATABASES = {
         conn_max_age=DB_CONN_MAX_AGE,
     ),
 }
+for db_config in DATABASES.values():
+    db_config["DISABLE_SERVER_SIDE_CURSORS"] = DB_DISABLE_SERVER_SIDE_CURSORS
 
 DATABASE_ROUTERS = ["saleor.core.db_routers.PrimaryReplicaRouter"]
 